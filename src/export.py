@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+from matplotlib.animation import FuncAnimation, PillowWriter
+
+# Mesmas cores do Visualizer (hospital amarelo; Alta vermelho; Baixa verde)
+HOSPITAL_COLOR = "#ffff00"
+HIGH_COLOR = "#c83232"
+LOW_COLOR = "#00c800"
+TRUCK_COLORS = ["#0096fa", "#ff7f0e", "#9467bd", "#17becf", "#e377c2", "#8c564b", "#bcbd22", "#7f7f7f"]
+
+def _truck_color(truck_id):
+    return TRUCK_COLORS[(truck_id - 1) % len(TRUCK_COLORS)]
+
+def _draw_points(ax, locs):
+    for name, lat, lon, produto, prioridade in locs:
+        if name.lower().startswith("hospital"):
+            ax.scatter(lon, lat, s=160, c=HOSPITAL_COLOR, edgecolors="black", zorder=3)
+        else:
+            color = LOW_COLOR if prioridade == "Baixa" else HIGH_COLOR
+            ax.scatter(lon, lat, s=40, c=color, edgecolors="black", linewidths=0.5, zorder=3)
+
+def _draw_route(ax, locs, route_indices, color, label=None):
+    lons = [locs[i][2] for i in route_indices]
+    lats = [locs[i][1] for i in route_indices]
+    return ax.plot(lons, lats, "-", color=color, linewidth=2, label=label, zorder=2)[0]
+
+def _new_axes(title):
+    fig = Figure(figsize=(9, 7))
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_title(title)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.set_aspect("equal", adjustable="datalim")
+    return fig, ax
+
+def render_truck_map(path, result):
+    """
+    Imagem estática da rota de um caminhão (formato pela extensão: .png/.svg).
+    result: dict com truck_id, locs, route_indices e distance (como em main.main).
+    """
+    fig, ax = _new_axes(f"Caminhão {result['truck_id']} — {result['distance']:.2f} km")
+    _draw_route(ax, result["locs"], result["route_indices"], _truck_color(result["truck_id"]))
+    _draw_points(ax, result["locs"])
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+def render_fleet_map(path, results):
+    """Imagem estática com as rotas de todos os caminhões (.png/.svg)."""
+    total = sum(r["distance"] for r in results)
+    fig, ax = _new_axes(f"Frota — {len(results)} caminhões, {total:.2f} km")
+    for r in results:
+        _draw_route(ax, r["locs"], r["route_indices"], _truck_color(r["truck_id"]),
+                    label=f"Caminhão {r['truck_id']} ({r['distance']:.1f} km)")
+    for r in results:
+        _draw_points(ax, r["locs"])
+    ax.legend(loc="best", fontsize=8)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+def render_folium_map(path, results):
+    """Mapa HTML interativo (folium) com uma camada por caminhão."""
+    import folium
+
+    depot = results[0]["locs"][0]
+    fmap = folium.Map(location=[depot[1], depot[2]], zoom_start=11)
+    folium.Marker([depot[1], depot[2]], tooltip=depot[0], icon=folium.Icon(color="orange")).add_to(fmap)
+
+    for r in results:
+        layer = folium.FeatureGroup(name=f"Caminhão {r['truck_id']}")
+        locs = r["locs"]
+        points = [[locs[i][1], locs[i][2]] for i in r["route_indices"]]
+        folium.PolyLine(points, color=_truck_color(r["truck_id"]), weight=4,
+                        tooltip=f"Caminhão {r['truck_id']} — {r['distance']:.2f} km").add_to(layer)
+        for order, idx in enumerate(r["route_indices"][1:-1], start=1):
+            name, lat, lon, produto, prioridade = locs[idx]
+            folium.CircleMarker(
+                [lat, lon], radius=6, fill=True, fill_opacity=0.9,
+                color=LOW_COLOR if prioridade == "Baixa" else HIGH_COLOR,
+                tooltip=f"{order}. {name} — {produto} | {prioridade}",
+            ).add_to(layer)
+        layer.add_to(fmap)
+
+    folium.LayerControl().add_to(fmap)
+    fmap.save(path)
+    return path
+
+def render_convergence_animation(path, locs, snapshots, fps=5):
+    """
+    GIF da evolução da rota a partir de snapshots (gen, route_indices, cost),
+    com a curva de custo ao lado.
+    """
+    fig = Figure(figsize=(12, 5))
+    ax_map = fig.add_subplot(1, 2, 1)
+    ax_cost = fig.add_subplot(1, 2, 2)
+    ax_map.set_aspect("equal", adjustable="datalim")
+    _draw_points(ax_map, locs)
+    line = _draw_route(ax_map, locs, snapshots[0][1], TRUCK_COLORS[0])
+
+    gens = [s[0] for s in snapshots]
+    costs = [s[2] for s in snapshots]
+    ax_cost.plot(gens, costs, color="#cccccc")
+    marker = ax_cost.plot([gens[0]], [costs[0]], "o", color=TRUCK_COLORS[0])[0]
+    ax_cost.set_xlabel("Geração")
+    ax_cost.set_ylabel("Custo")
+
+    def update(frame):
+        gen, route_indices, cost = snapshots[frame]
+        line.set_data([locs[i][2] for i in route_indices], [locs[i][1] for i in route_indices])
+        marker.set_data([gen], [cost])
+        ax_map.set_title(f"Geração {gen} — custo {cost:.2f}")
+        return line, marker
+
+    anim = FuncAnimation(fig, update, frames=len(snapshots), blit=False)
+    anim.save(path, writer=PillowWriter(fps=fps))
+    return path
+
+class SnapshotRecorder:
+    """
+    Callback do GA que guarda snapshots para a animação. O GA já só chama o callback em
+    melhoria, a cada callback_every gerações e na última geração; com every=None (padrão)
+    todas essas chamadas viram snapshot. Com every, só melhorias e gerações múltiplas de
+    every — mas a última chamada recebida é sempre mantida como quadro final.
+    Ao passar de max_frames, descarta um a cada dois snapshots antigos (memória limitada).
+    """
+    def __init__(self, every=None, max_frames=200):
+        self.every = every
+        self.max_frames = max_frames
+        self._snapshots = []
+        self._pending = None   # última chamada ainda não gravada
+        self._last_cost = float("inf")
+
+    @property
+    def snapshots(self):
+        return self._snapshots + ([self._pending] if self._pending is not None else [])
+
+    def __call__(self, gen, routes, best_cost):
+        flat_route = []
+        for route in routes:
+            if route:
+                flat_route.append(0)
+                flat_route.extend(route)
+                flat_route.append(0)
+        snapshot = (gen, flat_route, best_cost)
+
+        if self.every is None or best_cost < self._last_cost or gen % self.every == 0:
+            self._snapshots.append(snapshot)
+            self._pending = None
+            self._last_cost = best_cost
+            if len(self._snapshots) > self.max_frames:
+                self._snapshots = self._snapshots[::2]
+        else:
+            self._pending = snapshot
+
+class ExportWorker:
+    """
+    Renderiza em segundo plano, em um processo separado (contexto spawn): matplotlib/Pillow
+    e o GA disputariam o GIL em uma thread. Os render_* recebem só argumentos picklable.
+    submit() devolve um Future; close() espera tudo terminar e devolve os caminhos gerados.
+    """
+    def __init__(self, out_dir="output"):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self._futures = []
+
+    def path(self, filename):
+        return os.path.join(self.out_dir, filename)
+
+    def submit(self, fn, filename, *args, **kwargs):
+        future = self._executor.submit(fn, self.path(filename), *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def close(self):
+        paths = []
+        for future in self._futures:
+            try:
+                paths.append(future.result())
+            except Exception as exc:
+                print(f"⚠️ Falha ao exportar: {exc}")
+        self._executor.shutdown(wait=True)
+        return paths
@@ -1,4 +1,9 @@
-import random
+import math
+import time
+
+import numpy as np
+
+from telemetry import TelemetryRecord
 
 def split_routes(chromosome, num_trucks, max_per_truck):
     routes = [[] for _ in range(num_trucks)]
@@ -18,7 +23,7 @@ def _route_distance(distance_matrix, route):
     total += distance_matrix[route[-1]][0]
     return total
 
-def fitness(
+def fitness_parts(
     chromosome,
     distance_matrix,
     num_trucks=5,
@@ -30,6 +35,7 @@ def fitness(
     penalty_over_capacity=1e6,
     penalty_over_distance=1e6,
 ):
+    """Retorna (distância total em km, penalidade total); penalidade 0 = solução viável."""
     routes = split_routes(chromosome, num_trucks, max_per_truck)
     total_distance = 0.0
     total_penalty = 0.0
@@ -57,15 +63,63 @@ def fitness(
         if max_distance_per_truck is not None and dist_r > max_distance_per_truck:
             total_penalty += penalty_over_distance * max(0.0, dist_r - max_distance_per_truck)
 
+    return total_distance, total_penalty
+
+def fitness(
+    chromosome,
+    distance_matrix,
+    num_trucks=5,
+    max_per_truck=12,
+    *,
+    demands=None,
+    max_load_per_truck=None,
+    max_distance_per_truck=None,
+    penalty_over_capacity=1e6,
+    penalty_over_distance=1e6,
+):
+    total_distance, total_penalty = fitness_parts(
+        chromosome, distance_matrix, num_trucks, max_per_truck,
+        demands=demands,
+        max_load_per_truck=max_load_per_truck,
+        max_distance_per_truck=max_distance_per_truck,
+        penalty_over_capacity=penalty_over_capacity,
+        penalty_over_distance=penalty_over_distance,
+    )
     return total_distance + total_penalty
 
-def create_individual(num_clients):
-    clients = list(range(1, num_clients))
-    random.shuffle(clients)
-    return clients
+# --- Geradores aleatórios (um por execução; nada usa o estado global de `random`) ---
+def make_rng(seed=None):
+    """numpy.random.Generator próprio da execução; seed=None = entropia do sistema."""
+    return np.random.default_rng(seed)
+
+def spawn_rngs(seed, n):
+    """n geradores independentes (SeedSequence.spawn) para execuções/workers paralelos."""
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(n)]
+
+def _cut_points(size, rng, cuts):
+    # dois pontos distintos em [0, size); cuts = 2 uniformes já sorteados (ou None)
+    if cuts is None:
+        cuts = (rng if rng is not None else make_rng()).random(2).tolist()
+    a = int(cuts[0] * size)
+    b = int(cuts[1] * (size - 1))
+    if b >= a:
+        b += 1
+    return (int(a), int(b)) if a < b else (int(b), int(a))
 
-def crossover(parent1, parent2):
-    start, end = sorted(random.sample(range(len(parent1)), 2))
+def _mutation_draws(size, rng, draws):
+    # draws = (u, v): u decide se o gene sofre movimento, v escolhe o destino.
+    # Em genetic_algorithm são sorteados em lote (uma chamada por geração).
+    if draws is None:
+        draws = (rng if rng is not None else make_rng()).random((2, size))
+    return draws[0], draws[1]
+
+def create_individual(num_clients, rng=None):
+    rng = rng if rng is not None else make_rng()
+    return rng.permutation(np.arange(1, num_clients)).tolist()
+
+# --- Crossover ---
+def crossover(parent1, parent2, rng=None, cuts=None):
+    start, end = _cut_points(len(parent1), rng, cuts)
     child = [None] * len(parent1)
     child[start:end] = parent1[start:end]
     pos = end
@@ -77,17 +131,163 @@ def crossover(parent1, parent2):
             pos += 1
     return child
 
-def mutate(individual, mutation_rate=0.05):
-    for i in range(len(individual)):
-        if random.random() < mutation_rate:
-            j = random.randint(0, len(individual) - 1)
-            individual[i], individual[j] = individual[j], individual[i]
+def crossover_pmx(parent1, parent2, rng=None, cuts=None):
+    """Partially Mapped Crossover: copia um trecho de parent1 e mapeia os conflitos via parent2."""
+    size = len(parent1)
+    start, end = _cut_points(size, rng, cuts)
+    child = [None] * size
+    child[start:end] = parent1[start:end]
+    pos_in_p2 = {gene: i for i, gene in enumerate(parent2)}
+    segment = set(parent1[start:end])
+    for i in range(start, end):
+        gene = parent2[i]
+        if gene in segment:
+            continue
+        pos = i
+        while start <= pos < end:
+            pos = pos_in_p2[parent1[pos]]
+        child[pos] = gene
+    for i in range(size):
+        if child[i] is None:
+            child[i] = parent2[i]
+    return child
+
+# --- Mutação (cada gene sofre um movimento com probabilidade mutation_rate) ---
+def mutate(individual, mutation_rate=0.05, rng=None, draws=None):
+    n = len(individual)
+    u, v = _mutation_draws(n, rng, draws)
+    for i in np.flatnonzero(u < mutation_rate).tolist():
+        j = int(v[i] * n)
+        individual[i], individual[j] = individual[j], individual[i]
     return individual
 
-def selection(population, fitnesses, k=3):
-    selected = random.sample(list(zip(population, fitnesses)), k)
-    selected.sort(key=lambda x: x[1])
-    return selected[0][0]
+def mutate_insert(individual, mutation_rate=0.05, rng=None, draws=None):
+    n = len(individual)
+    u, v = _mutation_draws(n, rng, draws)
+    for i in np.flatnonzero(u < mutation_rate).tolist():
+        j = int(v[i] * n)
+        individual.insert(j, individual.pop(i))
+    return individual
+
+def mutate_two_opt(individual, mutation_rate=0.05, rng=None, draws=None):
+    n = len(individual)
+    u, v = _mutation_draws(n, rng, draws)
+    for i in np.flatnonzero(u < mutation_rate).tolist():
+        j = int(v[i] * n)
+        a, b = min(i, j), max(i, j)
+        individual[a:b + 1] = individual[a:b + 1][::-1]
+    return individual
+
+def mutate_or_opt(individual, mutation_rate=0.05, rng=None, draws=None, max_segment=3):
+    n = len(individual)
+    u, v = _mutation_draws(n, rng, draws)
+    for i in np.flatnonzero(u < mutation_rate).tolist():
+        # u[i] < mutation_rate: u[i] / mutation_rate é uniforme em [0, 1) e dá o tamanho do trecho
+        seg_len = 1 + int(u[i] / mutation_rate * max_segment)
+        segment = individual[i:i + seg_len]
+        rest = individual[:i] + individual[i + seg_len:]
+        j = int(v[i] * (len(rest) + 1))
+        individual[:] = rest[:j] + segment + rest[j:]
+    return individual
+
+CROSSOVER_OPERATORS = {
+    "ox": crossover,
+    "pmx": crossover_pmx,
+}
+
+MUTATION_OPERATORS = {
+    "swap": mutate,
+    "insert": mutate_insert,
+    "two_opt": mutate_two_opt,
+    "or_opt": mutate_or_opt,
+}
+
+def tournament_candidates(population_size, k, n_tournaments, rng):
+    """
+    Índices de n_tournaments torneios de k participantes distintos (sem reposição),
+    sorteados em lote: cada linha é uma permutação embaralhada, da qual se tomam k.
+    """
+    k = min(k, population_size)
+    rows = np.broadcast_to(np.arange(population_size), (n_tournaments, population_size))
+    return rng.permuted(rows, axis=1)[:, :k]
+
+def selection(population, fitnesses, k=3, rng=None, candidates=None):
+    # candidates: índices já sorteados (em lote, por genetic_algorithm); senão sorteia k sem reposição
+    if candidates is None:
+        rng = rng if rng is not None else make_rng()
+        candidates = tournament_candidates(len(population), k, 1, rng)[0].tolist()
+    best = min(candidates, key=lambda i: fitnesses[i])
+    return population[best]
+
+class AdaptiveOperatorSelector:
+    """
+    Escolha adaptativa de operadores (roleta com pesos).
+    Cada operador acumula a melhoria de custo que produziu e o custo de aplicá-lo
+    (segundos de CPU ou, no modo reprodutível, 1 por aplicação);
+    ao fim de cada geração os pesos são puxados para a taxa melhoria/custo observada.
+    min_prob garante que nenhum operador fique sem chance de ser reavaliado.
+    """
+    def __init__(self, operators, *, decay=0.3, min_prob=0.05, rng=None):
+        self.rng = rng if rng is not None else make_rng()
+        self.names = list(operators)
+        self.weights = {name: 1.0 / len(self.names) for name in self.names}
+        self.decay = decay
+        self.min_prob = min_prob
+        self._gain = {name: 0.0 for name in self.names}
+        self._time = {name: 0.0 for name in self.names}
+
+    def choose(self):
+        r = self.rng.random()
+        acc = 0.0
+        for name in self.names:
+            acc += self.weights[name]
+            if r < acc:
+                return name
+        return self.names[-1]
+
+    def record(self, name, gain, cost):
+        self._gain[name] += max(0.0, gain)
+        self._time[name] += max(cost, 1e-9)
+
+    def update(self):
+        rates = {
+            name: (self._gain[name] / self._time[name]) if self._time[name] > 0 else 0.0
+            for name in self.names
+        }
+        total = sum(rates.values())
+        if total > 0:
+            for name in self.names:
+                target = rates[name] / total
+                self.weights[name] = (1 - self.decay) * self.weights[name] + self.decay * target
+
+        # piso de probabilidade + renormalização
+        k = len(self.names)
+        floor = min(self.min_prob, 1.0 / k)
+        total_w = sum(self.weights.values())
+        for name in self.names:
+            self.weights[name] = floor + (1 - k * floor) * (self.weights[name] / total_w)
+
+        self._gain = {name: 0.0 for name in self.names}
+        self._time = {name: 0.0 for name in self.names}
+
+def auto_parameters(num_clients):
+    """
+    Parâmetros do GA escalados pelo tamanho da instância (nº de clientes, sem o depósito).
+    - população cresce ~ sqrt(n), limitada a [30, 300];
+    - mutation_rate ≈ 2 movimentos esperados por indivíduo, limitada a [0.005, 0.2];
+    - torneio mais seletivo em populações maiores.
+    Constantes escolhidas à mão; recalibre-as com a saída "VALORES SUGERIDOS" de
+    `python src/tuning.py` (varredura com as restrições de produção).
+    """
+    n = max(1, num_clients)
+    population_size = int(min(300, max(30, 10 * math.sqrt(n))))
+    mutation_rate = min(0.2, max(0.005, 2.0 / n))
+    tournament_k = 2 if population_size < 50 else (3 if population_size < 150 else 5)
+    return {
+        "population_size": population_size,
+        "mutation_rate": mutation_rate,
+        "tournament_k": tournament_k,
+    }
 
 def genetic_algorithm(
     distance_matrix,
@@ -97,59 +297,183 @@ def genetic_algorithm(
     population_size=50,
     generations=200,
     mutation_rate=0.05,
+    tournament_k=3,
+    elite_size=2,
+    adaptive=False,
+    adaptive_credit="cpu",
+    time_limit_s=None,
+    seed=None,
+    rng=None,
     demands=None,
     max_load_per_truck=None,
     max_distance_per_truck=None,
     penalty_over_capacity=1e6,
     penalty_over_distance=1e6,
     callback=None,
+    callback_every=25,
+    telemetry=None,
+    initial_individuals=None,
+    improve=None,
 ):
+    """
+    adaptive=True: crossover (OX/PMX) e mutação (swap/insert/2-opt/or-opt) são sorteados
+    por AdaptiveOperatorSelector, creditando a melhoria sobre o melhor pai por segundo de CPU
+    (adaptive_credit="cpu") ou por aplicação (adaptive_credit="eval", determinístico).
+    population_size/mutation_rate/tournament_k = None usam auto_parameters(nº de clientes).
+    elite_size: os melhores indivíduos de cada geração passam intactos para a próxima (elitismo).
+    time_limit_s interrompe a evolução quando o orçamento de tempo (parede) se esgota.
+    Toda a aleatoriedade vem de `rng` (ou de make_rng(seed)): mesma seed => mesma execução
+    (com adaptive_credit="eval" e sem time_limit_s, que dependem do relógio),
+    e execuções paralelas com geradores de spawn_rngs não compartilham estado.
+    callback(gen, routes, best_cost) só é chamado quando o melhor melhora, a cada
+    callback_every gerações e na última geração. telemetry (telemetry.Telemetry) recebe
+    estatísticas da população nas mesmas condições, segundo seu próprio sample_every.
+    initial_individuals: cromossomos (ex.: rota de uma heurística) que substituem os primeiros
+    indivíduos aleatórios da população inicial; com elite_size >= 1 o melhor deles permanece
+    na população até ser superado.
+    improve(cromossomo) -> cromossomo: busca local aplicada ao melhor filho de cada geração
+    (passo memético; ex.: solvers.local_search, válido para num_trucks=1).
+    """
+    rng = rng if rng is not None else make_rng(seed)
     num_clients = len(distance_matrix)
-    population = [create_individual(num_clients) for _ in range(population_size)]
+    auto = auto_parameters(num_clients - 1)
+    if population_size is None:
+        population_size = auto["population_size"]
+    if mutation_rate is None:
+        mutation_rate = auto["mutation_rate"]
+    if tournament_k is None:
+        tournament_k = auto["tournament_k"]
+    elite_size = max(0, min(elite_size, population_size))
+    num_children = population_size - elite_size
+
+    def evaluate(ind):
+        # (custo, viável?)
+        total_distance, total_penalty = fitness_parts(
+            ind, distance_matrix,
+            num_trucks=num_trucks,
+            max_per_truck=max_per_truck,
+            demands=demands,
+            max_load_per_truck=max_load_per_truck,
+            max_distance_per_truck=max_distance_per_truck,
+            penalty_over_capacity=penalty_over_capacity,
+            penalty_over_distance=penalty_over_distance,
+        )
+        return total_distance + total_penalty, total_penalty == 0.0
+
+    cross_selector = AdaptiveOperatorSelector(CROSSOVER_OPERATORS, rng=rng) if adaptive else None
+    mut_selector = AdaptiveOperatorSelector(MUTATION_OPERATORS, rng=rng) if adaptive else None
 
-    best_solution = None
-    best_cost = float("inf")
+    population = [create_individual(num_clients, rng) for _ in range(population_size)]
+    for i, ind in enumerate((initial_individuals or [])[:population_size]):
+        population[i] = list(ind)
+    evaluated = [evaluate(ind) for ind in population]
+    fitnesses = [cost for cost, _ in evaluated]
+    feasibles = [ok for _, ok in evaluated]
+
+    # a população inicial também conta para o melhor encontrado
+    best_index = min(range(population_size), key=lambda i: fitnesses[i])
+    best_solution = population[best_index]
+    best_cost = fitnesses[best_index]
+    deadline = (time.perf_counter() + time_limit_s) if time_limit_s is not None else None
+    last_gen = generations - 1
+    if telemetry is not None:
+        telemetry.total_evaluations += population_size
+        last_emit_time = time.perf_counter()
+        evals_since_emit = population_size
 
     for gen in range(generations):
-        fitnesses = [
-            fitness(
-                ind, distance_matrix,
-                num_trucks=num_trucks,
-                max_per_truck=max_per_truck,
-                demands=demands,
-                max_load_per_truck=max_load_per_truck,
-                max_distance_per_truck=max_distance_per_truck,
-                penalty_over_capacity=penalty_over_capacity,
-                penalty_over_distance=penalty_over_distance,
-            )
-            for ind in population
-        ]
-        new_population = []
-        for _ in range(population_size):
-            parent1 = selection(population, fitnesses)
-            parent2 = selection(population, fitnesses)
-            child = crossover(parent1, parent2)
-            child = mutate(child, mutation_rate=mutation_rate)
+        # elitismo: os elite_size melhores seguem sem crossover/mutação (e sem reavaliação)
+        elite = sorted(range(population_size), key=lambda i: fitnesses[i])[:elite_size]
+        new_population = [population[i] for i in elite]
+        new_fitnesses = [fitnesses[i] for i in elite]
+        new_feasibles = [feasibles[i] for i in elite]
+        cost_of = {id(ind): cost for ind, cost in zip(population, fitnesses)} if adaptive else None
+        # sorteios de toda a geração em lote: torneios (sem reposição), cortes do crossover e mutação
+        tournaments = tournament_candidates(
+            population_size, tournament_k, 2 * num_children, rng
+        ).reshape(num_children, 2, -1).tolist()
+        cuts = rng.random((num_children, 2)).tolist()
+        draws = rng.random((num_children, 2, num_clients - 1))
+        for c in range(num_children):
+            parent1 = selection(population, fitnesses, candidates=tournaments[c][0])
+            parent2 = selection(population, fitnesses, candidates=tournaments[c][1])
+            if adaptive:
+                cross_name = cross_selector.choose()
+                mut_name = mut_selector.choose()
+                t0 = time.process_time()
+                child = CROSSOVER_OPERATORS[cross_name](parent1, parent2, cuts=cuts[c])
+                t1 = time.process_time()
+                child = MUTATION_OPERATORS[mut_name](child, mutation_rate=mutation_rate, draws=draws[c])
+                t2 = time.process_time()
+                cost, ok = evaluate(child)
+                eval_time = time.process_time() - t2
+                gain = min(cost_of[id(parent1)], cost_of[id(parent2)]) - cost
+                if adaptive_credit == "cpu":
+                    cross_selector.record(cross_name, gain, (t1 - t0) + eval_time)
+                    mut_selector.record(mut_name, gain, (t2 - t1) + eval_time)
+                else:
+                    cross_selector.record(cross_name, gain, 1.0)
+                    mut_selector.record(mut_name, gain, 1.0)
+            else:
+                child = crossover(parent1, parent2, cuts=cuts[c])
+                child = mutate(child, mutation_rate=mutation_rate, draws=draws[c])
+                cost, ok = evaluate(child)
             new_population.append(child)
+            new_fitnesses.append(cost)
+            new_feasibles.append(ok)
+        if improve is not None and num_children:
+            # passo memético: busca local no melhor filho da geração
+            c = elite_size + min(range(num_children), key=lambda i: new_fitnesses[elite_size + i])
+            new_population[c] = improve(new_population[c])
+            new_fitnesses[c], new_feasibles[c] = evaluate(new_population[c])
+            if telemetry is not None:
+                telemetry.total_evaluations += 1
+                evals_since_emit += 1
         population = new_population
+        fitnesses = new_fitnesses
+        feasibles = new_feasibles
+
+        if adaptive:
+            cross_selector.update()
+            mut_selector.update()
 
-        for ind in population:
-            cost = fitness(
-                ind, distance_matrix,
-                num_trucks=num_trucks,
-                max_per_truck=max_per_truck,
-                demands=demands,
-                max_load_per_truck=max_load_per_truck,
-                max_distance_per_truck=max_distance_per_truck,
-                penalty_over_capacity=penalty_over_capacity,
-                penalty_over_distance=penalty_over_distance,
-            )
+        improved = False
+        for ind, cost in zip(population[elite_size:], fitnesses[elite_size:]):
             if cost < best_cost:
                 best_cost = cost
                 best_solution = ind
+                improved = True
+
+        timed_out = deadline is not None and time.perf_counter() >= deadline
+        is_last = timed_out or gen == last_gen
 
-        if callback and best_solution is not None:
+        if telemetry is not None:
+            telemetry.total_evaluations += num_children
+            evals_since_emit += num_children
+            if is_last or telemetry.should_emit(gen, improved):
+                now = time.perf_counter()
+                elapsed = now - last_emit_time
+                telemetry.emit(TelemetryRecord(
+                    gen=gen,
+                    best=best_cost,
+                    mean=sum(fitnesses) / population_size,
+                    worst=max(fitnesses),
+                    diversity=len({tuple(ind) for ind in population}) / population_size,
+                    feasible_ratio=sum(feasibles) / population_size,
+                    evals_per_s=(evals_since_emit / elapsed) if elapsed > 0 else 0.0,
+                    improved=improved,
+                ))
+                last_emit_time = now
+                evals_since_emit = 0
+
+        # rotas só são remontadas para o callback em melhoria, amostragem ou fim
+        if callback and best_solution is not None and (
+            improved or is_last or (callback_every and gen % callback_every == 0)
+        ):
             routes = split_routes(best_solution, num_trucks, max_per_truck)
             callback(gen, routes, best_cost)
 
+        if timed_out:
+            break
+
     return best_solution, best_cost
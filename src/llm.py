@@ -128,7 +128,16 @@ def prompt_daily_report(
             f"- Caminhão {r['truck_id']}: {r['stops']} paradas "
             f"(Alta={r['high_priority']}, Baixa={r['low_priority']}), "
             f"Distância={r['distance']:.2f}"
+            + (f", Método={r['method']}" if r.get("method") else "")
         )
+        ga_stats = r.get("ga_stats")
+        if ga_stats:
+            bullets.append(
+                f"  GA (população, não a rota entregue): {ga_stats['generations']} gerações, "
+                f"{ga_stats['total_evaluations']} avaliações ({ga_stats['evals_per_s']:.0f}/s), "
+                f"diversidade final {ga_stats['diversity']:.0%}, "
+                f"indivíduos viáveis na população final {ga_stats['feasible_ratio']:.0%}"
+            )
 
     header = "\n".join(bullets)
     return f"""
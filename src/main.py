@@ -1,3 +1,5 @@
+import argparse
+
 from utils import (
     load_locations,
     load_demands,
@@ -5,12 +7,22 @@ from utils import (
     summarize_route,
     route_distance,
     route_load,
+    build_groups,
+)
+from ga import spawn_rngs
+from solvers import solve_route, EXACT_MAX_CLIENTS, GA_MIN_CLIENTS
+from telemetry import Telemetry
+from export import (
+    ExportWorker,
+    SnapshotRecorder,
+    render_truck_map,
+    render_fleet_map,
+    render_folium_map,
+    render_convergence_animation,
 )
-from ga import genetic_algorithm, split_routes
-from visualize import Visualizer
 from llm import make_llm, generate_driver_instructions, generate_daily_report, answer_question
 
-def run_ga_for_group(
+def solve_group(
     group_id,
     locations_group,
     demands_group,
@@ -18,36 +30,60 @@ def run_ga_for_group(
     generations=500,
     population_size=60,
     mutation_rate=0.1,
+    tournament_k=3,
+    adaptive=False,
+    adaptive_credit="cpu",
+    rng=None,                  # numpy.random.Generator da execução (reprodutível)
     max_per_truck=12,          # limite por número de paradas (continua existindo)
     autonomy_km=250.0,         # autonomia mais realista para SP e região
     max_load_per_truck=80.0,   # capacidade (ex.: "kg" ou "unid. demanda")
+    exact_max_clients=EXACT_MAX_CLIENTS,  # até aqui: Held–Karp (ótimo)
+    ga_min_clients=GA_MIN_CLIENTS,        # acima daqui: GA; no meio: busca local (None = nunca GA)
+    interactive=True,          # False = sem janela pygame (execução desacompanhada)
+    recorder=None,             # export.SnapshotRecorder para a animação de convergência
+    telemetry_log=None,        # caminho do log binário de telemetria do GA (opcional)
 ):
     distance_matrix = build_distance_matrix(locations_group)
-    visualizer = Visualizer(locations_group, width=900, height=700)
+    telemetry = Telemetry(sample_every=50, ring_size=512, log_path=telemetry_log)
+    visualizer = None
+    if interactive:
+        from visualize import Visualizer  # pygame só é necessário no modo interativo
+        visualizer = Visualizer(locations_group, width=900, height=700)
 
     def callback(gen, routes, dist):
+        if recorder is not None:
+            recorder(gen, routes, dist)
+        if visualizer is None:
+            return
         flat_route = []
         for route in routes:
             if route:
                 flat_route.append(0)
                 flat_route.extend(route)
                 flat_route.append(0)
-        visualizer.draw(gen, flat_route, dist)
+        visualizer.draw(gen, flat_route, dist, telemetry=telemetry.last)
 
-    best_route, best_cost = genetic_algorithm(
+    best_route, best_cost, method = solve_route(
         distance_matrix,
-        num_trucks=1,
         max_per_truck=max_per_truck,
+        exact_max_clients=exact_max_clients,
+        ga_min_clients=ga_min_clients,
         population_size=population_size,
         generations=generations,
         mutation_rate=mutation_rate,
+        tournament_k=tournament_k,
+        adaptive=adaptive,
+        adaptive_credit=adaptive_credit,
+        rng=rng,
         demands=demands_group,
         max_load_per_truck=max_load_per_truck,
         max_distance_per_truck=autonomy_km,
         penalty_over_capacity=1e6,
         penalty_over_distance=1e6,
-        callback=callback
+        callback=callback if (visualizer is not None or recorder is not None) else None,
+        telemetry=telemetry,
     )
+    telemetry.close()
 
     # métricas reais (km/carga)
     real_dist = route_distance(distance_matrix, best_route)
@@ -61,17 +97,36 @@ def run_ga_for_group(
         f"Distância (rota): {real_dist:.2f} km  {'⚠️> autonomia' if warn_auto else ''}",
         f"Carga: {load_sum:.2f} / {max_load_per_truck if max_load_per_truck is not None else 'N/A'}  {'⚠️> capacidade' if warn_load else ''}",
         f"Paradas máx.: {max_per_truck}",
+        f"Método: {method}",
     ]
-    visualizer.draw(
-        generations,
-        [0] + best_route + [0],
-        best_cost,
-        overlay="\n".join(overlay_lines)
-    )
+    if visualizer is not None:
+        visualizer.draw(
+            generations,
+            [0] + best_route + [0],
+            best_cost,
+            overlay="\n".join(overlay_lines),
+            telemetry=telemetry.last,
+        )
+
+    return best_route, best_cost, real_dist, load_sum, method, telemetry.summary(), visualizer
 
-    return best_route, best_cost, real_dist, load_sum, visualizer
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Roteirização hospitalar com GA + LLM.")
+    parser.add_argument("--headless", action="store_true",
+                        help="sem janela pygame e sem esperar ENTER (execução desacompanhada)")
+    parser.add_argument("--export-dir", default="output",
+                        help="pasta dos mapas/animações exportados")
+    parser.add_argument("--no-export", action="store_true", help="não exporta mapas/animações")
+    parser.add_argument("--force-ga", action="store_true",
+                        help="usa o GA em todos os grupos (senão grupos pequenos vão para Held–Karp "
+                             "e não há animação de convergência)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    interactive = not args.headless
+    export_formats = ("png", "svg")   # imagens estáticas por caminhão e da frota
 
-def main():
     csv_path = "data/clientes_pedidos.csv"
     all_locations = load_locations(csv_path)
     all_demands = load_demands(csv_path)  # agora demanda ≠ #paradas (se não houver coluna, infere por produto)
@@ -79,8 +134,11 @@ def main():
     num_trucks = 5
     max_per_truck = 12
     ga_generations = 500
-    ga_population = 60
-    ga_mutation = 0.1
+    ga_population = None    # None = escala com o nº de clientes (ga.auto_parameters)
+    ga_mutation = None      # None = escala com o nº de clientes (ga.auto_parameters)
+    ga_tournament_k = None  # None = escala com o tamanho da população
+    ga_adaptive = True      # operadores escolhidos pela melhoria/segundo de CPU
+    ga_seed = 42            # mesma seed => mesmas rotas (None = aleatório a cada execução)
 
     # parâmetros realistas
     autonomy_km = 250.0         # autonomia por veículo (km)
@@ -94,31 +152,38 @@ def main():
     }
 
     # grupos (cada grupo ≈ 1 caminhão)
-    groups = []
-    for i in range(num_trucks):
-        start = 1 + i * max_per_truck
-        end = start + max_per_truck
-        loc_group = [all_locations[0]] + all_locations[start:end]
-        dem_group = [all_demands[0]] + all_demands[start:end]
-        if len(loc_group) > 1:
-            groups.append((i + 1, loc_group, dem_group))
+    groups = build_groups(all_locations, all_demands, num_trucks, max_per_truck)
+    # um gerador independente por caminhão: resultado de cada grupo não depende dos demais
+    group_rngs = spawn_rngs(ga_seed, len(groups))
 
     results = []
     llm = make_llm()
+    # renderização em segundo plano: não bloqueia a otimização nem o LLM
+    exporter = None if args.no_export else ExportWorker(args.export_dir)
 
-    for truck_id, locs, demands_group in groups:
-        print(f"\n--- Otimizando Caminhão {truck_id} (clientes: {len(locs)-1}) — {ga_generations} gerações ---")
-        best_route, best_cost, real_dist, load_sum, viz = run_ga_for_group(
+    for (truck_id, locs, demands_group), rng in zip(groups, group_rngs):
+        print(f"\n--- Otimizando Caminhão {truck_id} (clientes: {len(locs)-1}) ---")
+        recorder = SnapshotRecorder() if exporter is not None else None
+        best_route, best_cost, real_dist, load_sum, method, ga_stats, viz = solve_group(
             truck_id, locs, demands_group,
             generations=ga_generations,
             population_size=ga_population,
             mutation_rate=ga_mutation,
+            tournament_k=ga_tournament_k,
+            adaptive=ga_adaptive,
+            # com seed fixa, crédito por aplicação (o crédito por CPU depende do relógio)
+            adaptive_credit="eval" if ga_seed is not None else "cpu",
+            rng=rng,
             max_per_truck=max_per_truck,
             autonomy_km=autonomy_km,
             max_load_per_truck=max_load_per_truck,
+            interactive=interactive,
+            recorder=recorder,
+            **(dict(exact_max_clients=0, ga_min_clients=0) if args.force_ga else {}),
+            telemetry_log=exporter.path(f"caminhao_{truck_id}_telemetria.bin") if exporter is not None else None,
         )
 
-        print(f"Resumo Caminhão {truck_id}:")
+        print(f"Resumo Caminhão {truck_id} (método: {method}):")
         print(f" - Distância (rota): {real_dist:.2f} km (autonomia: {autonomy_km:.2f} km) {'⚠️ EXCEDE' if real_dist>autonomy_km else ''}")
         print(f" - Carga estimada: {load_sum:.2f} (capacidade: {max_load_per_truck:.2f}) {'⚠️ EXCEDE' if load_sum>max_load_per_truck else ''}")
 
@@ -126,15 +191,16 @@ def main():
         route_names = [f"{locs[idx][0]} [{locs[idx][3]} | {locs[idx][4]}]" for idx in route_indices]
         stops, high, low = summarize_route(route_indices, locs)
 
-        viz.hold_until_enter(
-            message=(
-                f"Caminhão {truck_id}\n"
-                f"Distância (rota): {real_dist:.2f} / {autonomy_km:.2f} km\n"
-                f"Carga: {load_sum:.2f} / {max_load_per_truck:.2f}\n"
-                f"Paradas: {stops}  (Alta={high}, Baixa={low})\n\n"
-                f"Pressione ENTER para gerar instruções do motorista..."
+        if viz is not None:
+            viz.hold_until_enter(
+                message=(
+                    f"Caminhão {truck_id}\n"
+                    f"Distância (rota): {real_dist:.2f} / {autonomy_km:.2f} km\n"
+                    f"Carga: {load_sum:.2f} / {max_load_per_truck:.2f}\n"
+                    f"Paradas: {stops}  (Alta={high}, Baixa={low})\n\n"
+                    f"Pressione ENTER para gerar instruções do motorista..."
+                )
             )
-        )
 
         # passa carga/distância reais pro LLM (para alertar se exceder)
         constraints = dict(constraints_base)
@@ -162,8 +228,22 @@ def main():
             "high_priority": high,
             "low_priority": low,
             "load_sum": load_sum,
+            "method": method,
+            "ga_stats": ga_stats,   # None quando o grupo não passou pelo GA
         })
 
+        if exporter is not None:
+            for ext in export_formats:
+                exporter.submit(render_truck_map, f"caminhao_{truck_id}.{ext}", results[-1])
+            if len(recorder.snapshots) > 1:
+                exporter.submit(render_convergence_animation, f"caminhao_{truck_id}_convergencia.gif",
+                                locs, recorder.snapshots)
+
+    if exporter is not None and results:
+        for ext in export_formats:
+            exporter.submit(render_fleet_map, f"frota.{ext}", results)
+        exporter.submit(render_folium_map, "frota.html", results)
+
     # relatório consolidado
     routes_summary = [{
         "truck_id": r["truck_id"],
@@ -172,6 +252,8 @@ def main():
         "high_priority": r["high_priority"],
         "low_priority": r["low_priority"],
         "route_names": r["route_names"],
+        "method": r["method"],
+        "ga_stats": r["ga_stats"],
     } for r in results]
 
     print("\n\n=== RELATÓRIO DIÁRIO ===")
@@ -184,6 +266,12 @@ def main():
     qa_text = answer_question(llm, sample_question, routes_summary)
     print(qa_text)
 
+    if exporter is not None:
+        paths = exporter.close()
+        print("\n\n=== ARQUIVOS EXPORTADOS ===")
+        for path in paths:
+            print(f" - {path}")
+
 if __name__ == "__main__":
     print(">>> chamando main()")
     main()
@@ -0,0 +1,222 @@
+import math
+
+import numpy as np
+
+from ga import genetic_algorithm, fitness
+from utils import route_distance
+
+# Limites da escolha automática de solver (nº de clientes, sem o depósito)
+EXACT_MAX_CLIENTS = 13    # Held–Karp: O(2^n · n²) — 13 clientes ≈ 8k estados x 13
+# GA (com elitismo e busca local no melhor filho) acima deste nº de clientes: em
+# `python src/tuning.py --solvers` (500 gerações, 6 seeds) ele supera a busca local em 1–3 de 6
+# instâncias de 16–25 clientes e em 4–6 de 6 a partir de 30 (ganhos de até 10%), por ~1–25 s por rota.
+GA_MIN_CLIENTS = 25
+
+def held_karp(distance_matrix):
+    """
+    Rota ótima (TSP fechando no depósito 0) por programação dinâmica em bitmask.
+    dp[mask, j] = menor custo saindo do depósito, visitando o conjunto `mask` e terminando em j
+    (cliente j+1 da matriz). As camadas são processadas por nº de bits, vetorizadas em numpy.
+    Retorna (rota sem o depósito, distância).
+    """
+    D = np.asarray(distance_matrix, dtype=float)
+    n = len(D) - 1
+    if n <= 0:
+        return [], 0.0
+    if n == 1:
+        return [1], float(D[0, 1] + D[1, 0])
+
+    C = D[1:, 1:]  # distâncias entre clientes
+    full = 1 << n
+    dp = np.full((full, n), np.inf)
+    parent = np.full((full, n), -1, dtype=np.int64)
+    for j in range(n):
+        dp[1 << j, j] = D[0, j + 1]
+
+    masks = np.arange(full)
+    popcount = np.zeros(full, dtype=np.int64)
+    for j in range(n):
+        popcount += (masks >> j) & 1
+
+    for size in range(2, n + 1):
+        layer = masks[popcount == size]
+        for j in range(n):
+            bit = 1 << j
+            sel = layer[(layer & bit) != 0]
+            prev = sel ^ bit
+            cand = dp[prev] + C[:, j]          # (len(sel), n): chegar em j vindo de k
+            best_k = np.argmin(cand, axis=1)
+            dp[sel, j] = cand[np.arange(len(sel)), best_k]
+            parent[sel, j] = best_k
+
+    last = dp[full - 1] + D[1:, 0]
+    j = int(np.argmin(last))
+    cost = float(last[j])
+
+    route = []
+    mask = full - 1
+    while j >= 0:
+        route.append(j + 1)
+        prev_j = int(parent[mask, j])
+        mask ^= 1 << j
+        j = prev_j
+    route.reverse()
+    return route, cost
+
+def nearest_neighbor_route(distance_matrix):
+    """Construção gulosa: sai do depósito e vai sempre ao cliente mais próximo ainda não visitado."""
+    unvisited = set(range(1, len(distance_matrix)))
+    route = []
+    current = 0
+    while unvisited:
+        nxt = min(unvisited, key=lambda c: distance_matrix[current][c])
+        route.append(nxt)
+        unvisited.remove(nxt)
+        current = nxt
+    return route
+
+def two_opt(distance_matrix, route):
+    """2-opt (primeira melhoria) sobre a rota fechada no depósito; altera `route` no lugar."""
+    D = distance_matrix
+    tour = [0] + route + [0]
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(tour) - 2):
+            a, b = tour[i - 1], tour[i]
+            for k in range(i + 1, len(tour) - 1):
+                c, d = tour[k], tour[k + 1]
+                delta = D[a][c] + D[b][d] - D[a][b] - D[c][d]
+                if delta < -1e-10:
+                    tour[i:k + 1] = tour[i:k + 1][::-1]
+                    b = tour[i]
+                    improved = True
+    route[:] = tour[1:-1]
+    return route
+
+def or_opt(distance_matrix, route, max_segment=3):
+    """Or-opt: move trechos de 1..max_segment clientes para a melhor posição (ambos os sentidos)."""
+    D = distance_matrix
+    improved = True
+    while improved:
+        improved = False
+        for seg_len in range(1, max_segment + 1):
+            i = 0
+            while i + seg_len <= len(route):
+                tour = [0] + route + [0]
+                p, s0, s1, q = tour[i], tour[i + 1], tour[i + seg_len], tour[i + seg_len + 1]
+                removal_gain = D[p][s0] + D[s1][q] - D[p][q]
+                rest = route[:i] + route[i + seg_len:]
+                segment = route[i:i + seg_len]
+                rest_tour = [0] + rest + [0]
+                best = None
+                for pos in range(len(rest_tour) - 1):
+                    u, v = rest_tour[pos], rest_tour[pos + 1]
+                    fwd = D[u][s0] + D[s1][v] - D[u][v]
+                    rev = D[u][s1] + D[s0][v] - D[u][v]
+                    for add, reverse in ((fwd, False), (rev, True)):
+                        if add - removal_gain < -1e-10 and (best is None or add < best[0]):
+                            best = (add, pos, reverse)
+                if best is not None:
+                    _, pos, reverse = best
+                    seg = segment[::-1] if reverse else segment
+                    route[:] = rest[:pos] + seg + rest[pos:]
+                    improved = True
+                else:
+                    i += 1
+    return route
+
+def local_search(distance_matrix, route):
+    """Alterna 2-opt e Or-opt até nenhum dos dois melhorar a rota."""
+    best = route_distance(distance_matrix, route)
+    while True:
+        two_opt(distance_matrix, route)
+        or_opt(distance_matrix, route)
+        dist = route_distance(distance_matrix, route)
+        if dist >= best - 1e-10:
+            return route
+        best = dist
+
+def solve_route(
+    distance_matrix,
+    max_per_truck=12,
+    *,
+    demands=None,
+    max_load_per_truck=None,
+    max_distance_per_truck=None,
+    penalty_over_capacity=1e6,
+    penalty_over_distance=1e6,
+    exact_max_clients=EXACT_MAX_CLIENTS,
+    ga_min_clients=GA_MIN_CLIENTS,
+    callback=None,
+    **ga_kwargs,
+):
+    """
+    Rota de UM caminhão com escolha automática do solver pelo nº de clientes:
+    - até exact_max_clients: Held–Karp (ótimo exato);
+    - até ga_min_clients (None = sem limite): vizinho mais próximo + 2-opt/Or-opt;
+    - acima disso: genetic_algorithm semeado com a rota da busca local e com busca local no
+      melhor filho de cada geração, seguido de nova busca local; fica a melhor das duas
+      (ga_kwargs repassados). callback só é usado aqui: recebe, na geração 0, a rota do
+      vizinho mais próximo e a da busca local, depois as do GA e, se não for a melhor do GA,
+      a rota devolvida (geração seguinte à última).
+    Em uma rota única, carga e nº de paradas não dependem da ordem e a penalidade de autonomia
+    cresce com a distância, então minimizar a distância minimiza o mesmo custo do GA.
+    Retorna (rota, custo com penalidades, nome do método).
+    """
+    num_clients = len(distance_matrix) - 1
+    penalties = dict(
+        demands=demands,
+        max_load_per_truck=max_load_per_truck,
+        max_distance_per_truck=max_distance_per_truck,
+        penalty_over_capacity=penalty_over_capacity,
+        penalty_over_distance=penalty_over_distance,
+    )
+
+    def cost_of(route):
+        return fitness(route, distance_matrix, num_trucks=1, max_per_truck=max_per_truck, **penalties)
+
+    if num_clients <= exact_max_clients:
+        route, _ = held_karp(distance_matrix)
+        return route, cost_of(route), "held_karp"
+
+    initial = nearest_neighbor_route(distance_matrix)
+    route = local_search(distance_matrix, list(initial))
+    cost = cost_of(route)
+    if ga_min_clients is None or num_clients <= ga_min_clients:
+        return route, cost, "local_search"
+
+    # a animação mostra toda a construção: vizinho mais próximo, busca local (semente),
+    # gerações do GA e, por último, a rota devolvida quando ela não é a melhor do GA
+    last_gen = 0
+    ga_callback = None
+    if callback is not None:
+        callback(0, [initial], cost_of(initial))
+        callback(0, [route], cost)
+
+        def ga_callback(gen, routes, best_cost):
+            nonlocal last_gen
+            last_gen = gen
+            callback(gen, routes, best_cost)
+
+    # GA semeado com a rota da busca local; o resultado passa de novo pela busca local
+    ga_best, _ = genetic_algorithm(
+        distance_matrix,
+        num_trucks=1,
+        max_per_truck=max_per_truck,
+        callback=ga_callback,
+        initial_individuals=[route],
+        improve=lambda r: local_search(distance_matrix, r),
+        **penalties,
+        **ga_kwargs,
+    )
+    ga_route = local_search(distance_matrix, list(ga_best))
+    ga_cost = cost_of(ga_route)
+    # com penalidades (~1e6) a diferença de arredondamento passa de 1e-10: tolerância relativa
+    if ga_cost < cost and not math.isclose(ga_cost, cost):
+        route, cost, method = ga_route, ga_cost, "ga"
+    else:
+        method = "local_search"
+    if callback is not None and route != list(ga_best):
+        callback(last_gen + 1, [route], cost)  # quadro final = rota devolvida
+    return route, cost, method
@@ -0,0 +1,100 @@
+import os
+import struct
+from collections import deque
+from typing import NamedTuple
+
+class TelemetryRecord(NamedTuple):
+    gen: int
+    best: float            # melhor custo já encontrado
+    mean: float            # custo médio da população na geração
+    worst: float           # pior custo da população na geração
+    diversity: float       # fração de indivíduos distintos na população (0..1]
+    feasible_ratio: float  # fração da população sem penalidade (não diz se a rota final é viável)
+    evals_per_s: float     # avaliações de fitness por segundo desde o último registro
+    improved: bool         # registro emitido por melhoria (senão, por amostragem)
+
+# Registro binário de tamanho fixo (little-endian): 1 uint32 + 6 float64 + 1 bool = 53 bytes
+_RECORD = struct.Struct("<I6d?")
+
+def read_log(path):
+    """Lê (em streaming) um log binário gravado por TelemetryLog."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_RECORD.size)
+            if len(chunk) < _RECORD.size:
+                return
+            yield TelemetryRecord(*_RECORD.unpack(chunk))
+
+class TelemetryLog:
+    """Log binário append-only, compacto (53 bytes por registro); memória constante.
+    Um arquivo por execução: um log antigo no mesmo caminho é descartado na criação,
+    e o arquivo novo só é criado no primeiro registro."""
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, record):
+        if self._file is None:
+            self._file = open(self.path, "wb")
+        self._file.write(_RECORD.pack(*record))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class Telemetry:
+    """
+    Fluxo de telemetria do GA.
+    - should_emit(): só registra em melhoria ou a cada `sample_every` gerações;
+    - os registros ficam em um ring buffer de `ring_size` (deque com maxlen) e,
+      opcionalmente, em um TelemetryLog binário e em assinantes (funções record -> None).
+    Memória limitada independentemente do nº de gerações.
+    """
+    def __init__(self, sample_every=50, ring_size=1024, log_path=None, subscribers=None):
+        self.sample_every = sample_every
+        self.ring = deque(maxlen=ring_size)
+        self.log = TelemetryLog(log_path) if log_path else None
+        self.subscribers = list(subscribers or [])
+        self.emitted = 0
+        self.improvements = 0
+        self.total_evaluations = 0
+
+    def should_emit(self, gen, improved):
+        return improved or bool(self.sample_every and gen % self.sample_every == 0)
+
+    def emit(self, record):
+        self.ring.append(record)
+        self.emitted += 1
+        self.improvements += record.improved
+        if self.log is not None:
+            self.log.write(record)
+        for fn in self.subscribers:
+            fn(record)
+
+    @property
+    def last(self):
+        return self.ring[-1] if self.ring else None
+
+    def summary(self):
+        """Resumo compacto (para relatório/benchmark); None se nada foi registrado."""
+        if not self.ring:
+            return None
+        last = self.ring[-1]
+        rates = [r.evals_per_s for r in self.ring if r.evals_per_s > 0]
+        return {
+            "generations": last.gen + 1,
+            "best": last.best,
+            "mean": last.mean,
+            "diversity": last.diversity,
+            "feasible_ratio": last.feasible_ratio,
+            "evals_per_s": (sum(rates) / len(rates)) if rates else 0.0,
+            "total_evaluations": self.total_evaluations,
+            "improvements": self.improvements,
+        }
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import math
+import random
+import time
+
+from utils import load_locations, load_demands, build_distance_matrix, build_groups
+from ga import genetic_algorithm, auto_parameters
+from telemetry import Telemetry
+from solvers import solve_route, GA_MIN_CLIENTS
+
+# Grade padrão da varredura (None = valor de ga.auto_parameters para a instância)
+DEFAULT_GRID = {
+    "population_size": [None, 30, 60, 120],
+    "mutation_rate": [None, 0.02, 0.05, 0.1],
+    "tournament_k": [None, 2, 3, 5],
+    "adaptive": [False, True],
+}
+
+# Restrições de produção (mesmos valores de main.main): o GA é ajustado com as penalidades reais
+PRODUCTION_CONSTRAINTS = {
+    "max_per_truck": 12,
+    "max_load_per_truck": 80.0,
+    "max_distance_per_truck": 250.0,
+}
+
+def load_benchmark_instances(
+    csv_paths,
+    num_trucks=5,
+    min_clients=GA_MIN_CLIENTS + 1,
+    constraints=PRODUCTION_CONSTRAINTS,
+):
+    """
+    Instâncias de benchmark do GA a partir dos CSVs, com as restrições de produção:
+    - cada grupo por caminhão (como em main.main), 1 caminhão;
+    - o CSV inteiro como VRP: ceil(clientes / max_per_truck) caminhões, rotas via split_routes.
+    Instâncias com menos de min_clients ficam de fora: solve_route as resolve por
+    Held–Karp ou busca local, então nunca chegam ao GA.
+    Retorna lista: (nome, distance_matrix, demands, kwargs de restrição do genetic_algorithm)
+    """
+    max_per_truck = constraints["max_per_truck"]
+    instances = []
+    for path in csv_paths:
+        locations = load_locations(path)
+        demands = load_demands(path)
+        candidates = [
+            (f"{path}#caminhao{truck_id}", locs, dem, 1)
+            for truck_id, locs, dem in build_groups(locations, demands, num_trucks, max_per_truck)
+        ]
+        if len(locations) - 1 > max_per_truck:
+            trucks = math.ceil((len(locations) - 1) / max_per_truck)
+            candidates.append((f"{path}#completo", locations, demands, trucks))
+        for name, locs, dem, trucks in candidates:
+            if len(locs) - 1 >= min_clients:
+                instances.append((name, build_distance_matrix(locs), dem, dict(constraints, num_trucks=trucks)))
+    return instances
+
+def compare_solvers(sizes=(16, 20, 25, 30, 40, 60, 100), seeds=tuple(range(6)), generations=500):
+    """
+    Benchmark do limiar GA_MIN_CLIENTS em instâncias aleatórias (pontos no quadrado unitário):
+    busca local sozinha vs. o ramo GA de solve_route (GA semeado, com elitismo e busca local
+    no melhor filho, + busca local no fim). Imprime, por tamanho, em quantas seeds o GA venceu.
+    Retorna lista de dicts (n, seed, custos e tempos).
+    """
+    rows = []
+    for n in sizes:
+        for seed in seeds:
+            r = random.Random(seed)
+            pts = [(r.random(), r.random()) for _ in range(n + 1)]
+            D = [[((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2) ** 0.5 for q in pts] for p in pts]
+            t0 = time.perf_counter()
+            _, ls_cost, _ = solve_route(D, n + 1, ga_min_clients=None)
+            t1 = time.perf_counter()
+            _, ga_cost, method = solve_route(
+                D, n + 1, ga_min_clients=0, generations=generations, adaptive=True, seed=seed,
+                population_size=None, mutation_rate=None, tournament_k=None,
+            )
+            t2 = time.perf_counter()
+            rows.append({"n": n, "seed": seed, "local_search": ls_cost, "ls_s": t1 - t0,
+                         "ga": ga_cost, "ga_s": t2 - t1, "ga_method": method})
+            print(f"n={n} seed={seed}: busca local {ls_cost:.3f} ({t1 - t0:.2f}s) | "
+                  f"GA+busca local {ga_cost:.3f} [{method}] ({t2 - t1:.2f}s)")
+        wins = sum(row["ga_method"] == "ga" for row in rows if row["n"] == n)
+        print(f"n={n}: GA melhor em {wins}/{len(seeds)} seeds")
+    return rows
+
+def run_config(instance, config, *, eval_budget=None, time_budget_s=None, seeds=(0,)):
+    """
+    Roda uma configuração em uma instância (com as restrições da própria instância).
+    - eval_budget (padrão): nº fixo de avaliações de fitness, convertido em gerações pelo
+      tamanho da população, com adaptive_credit="eval" — mesma seed => mesmo resultado;
+    - time_budget_s: orçamento de tempo (parede); não reprodutível.
+    Retorna (custo médio, avaliações de fitness por segundo médias).
+    """
+    if (eval_budget is None) == (time_budget_s is None):
+        raise ValueError("Informe exatamente um entre eval_budget e time_budget_s.")
+    _, distance_matrix, demands, constraints = instance
+    if eval_budget is not None:
+        population_size = config.get("population_size") or auto_parameters(len(distance_matrix) - 1)["population_size"]
+        budget = dict(generations=max(1, eval_budget // population_size), adaptive_credit="eval")
+    else:
+        budget = dict(generations=100_000, time_limit_s=time_budget_s)
+    costs = []
+    rates = []
+    for seed in seeds:
+        telemetry = Telemetry(sample_every=0, ring_size=64)  # só melhorias e o fim
+        t0 = time.perf_counter()
+        _, cost = genetic_algorithm(
+            distance_matrix,
+            seed=seed,
+            demands=demands,
+            **constraints,
+            telemetry=telemetry,
+            **budget,
+            **config,
+        )
+        costs.append(cost)
+        rates.append(telemetry.total_evaluations / max(time.perf_counter() - t0, 1e-9))
+    return sum(costs) / len(costs), sum(rates) / len(rates)
+
+def sweep(instances, grid=None, *, eval_budget=None, time_budget_s=None, seeds=(0,), verbose=True):
+    """
+    Varredura offline de parâmetros: cada combinação da grade roda com o mesmo orçamento
+    (avaliações ou tempo, ver run_config) por instância. O ranking usa o custo médio
+    normalizado pelo melhor custo encontrado em cada instância (1.0 = melhor configuração
+    naquela instância).
+    Retorna (ranking, melhores):
+    - ranking: lista de (score, config), ordenada do melhor para o pior;
+    - melhores: por instância, (nome, nº de clientes, config vencedora com os None
+      resolvidos por auto_parameters, custo) — os valores que auto_parameters deveria dar.
+    """
+    grid = grid or DEFAULT_GRID
+    keys = list(grid)
+    configs = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+    table = []  # table[c][i] = custo da config c na instância i
+    for c, config in enumerate(configs):
+        t0 = time.perf_counter()
+        runs = [
+            run_config(inst, config, eval_budget=eval_budget, time_budget_s=time_budget_s, seeds=seeds)
+            for inst in instances
+        ]
+        row = [cost for cost, _ in runs]
+        table.append(row)
+        if verbose:
+            rate = sum(r for _, r in runs) / len(runs)
+            print(f"[{c + 1}/{len(configs)}] {config} -> {sum(row):.2f} "
+                  f"({rate:,.0f} aval/s, {time.perf_counter() - t0:.1f}s)")
+
+    best_per_instance = [min(table[c][i] for c in range(len(configs))) for i in range(len(instances))]
+    ranking = []
+    for config, row in zip(configs, table):
+        ratios = [cost / best for cost, best in zip(row, best_per_instance) if best > 0]
+        score = sum(ratios) / len(ratios) if ratios else float("inf")
+        ranking.append((score, config))
+    ranking.sort(key=lambda x: x[0])
+
+    winners = []
+    for i, (name, distance_matrix, _, _) in enumerate(instances):
+        c = min(range(len(configs)), key=lambda c: table[c][i])
+        num_clients = len(distance_matrix) - 1
+        resolved = dict(auto_parameters(num_clients))
+        resolved.update({k: v for k, v in configs[c].items() if v is not None})
+        winners.append((name, num_clients, resolved, table[c][i]))
+    return ranking, winners
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura offline de parâmetros do GA nas instâncias de benchmark.")
+    parser.add_argument("csv", nargs="*", default=["data/clientes_pedidos.csv"])
+    parser.add_argument("--evals", type=int, default=20_000,
+                        help="orçamento de avaliações de fitness por execução (determinístico)")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="orçamento de tempo (s) por execução; substitui --evals (não reprodutível)")
+    parser.add_argument("--seeds", type=int, default=1, help="nº de repetições por configuração")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--solvers", action="store_true",
+                        help="só compara busca local vs. GA semeado (limiar GA_MIN_CLIENTS)")
+    args = parser.parse_args()
+
+    if args.solvers:
+        compare_solvers()
+        return
+
+    instances = load_benchmark_instances(args.csv)
+    if not instances:
+        raise SystemExit(f"Nenhuma instância com mais de {GA_MIN_CLIENTS} clientes nos CSVs informados.")
+    print(f"{len(instances)} instâncias; auto_parameters por tamanho:")
+    for name, distance_matrix, _, _ in instances:
+        print(f" - {name} (clientes: {len(distance_matrix) - 1}): {auto_parameters(len(distance_matrix) - 1)}")
+
+    ranking, winners = sweep(
+        instances,
+        eval_budget=None if args.budget is not None else args.evals,
+        time_budget_s=args.budget,
+        seeds=tuple(range(args.seeds)),
+    )
+    print("\n=== MELHORES CONFIGURAÇÕES ===")
+    for score, config in ranking[:args.top]:
+        print(f"{score:.4f}  {config}")
+
+    # valores a levar para ga.auto_parameters (por tamanho de instância)
+    print("\n=== VALORES SUGERIDOS PARA ga.auto_parameters ===")
+    for name, num_clients, resolved, cost in sorted(winners, key=lambda w: w[1]):
+        print(f" - {num_clients} clientes ({name}): {resolved}  custo={cost:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -105,3 +105,19 @@ def summarize_route(best_route_indices, locs):
             low += 1
     stops = max(0, len(best_route_indices) - 2)
     return stops, high, low
+
+def build_groups(locations, demands, num_trucks, max_per_truck):
+    """
+    Grupos (cada grupo ≈ 1 caminhão): blocos sequenciais de até max_per_truck clientes,
+    sempre com o depósito (idx 0) na frente.
+    Retorna lista: (truck_id, locations_group, demands_group)
+    """
+    groups = []
+    for i in range(num_trucks):
+        start = 1 + i * max_per_truck
+        end = start + max_per_truck
+        loc_group = [locations[0]] + locations[start:end]
+        dem_group = [demands[0]] + demands[start:end]
+        if len(loc_group) > 1:
+            groups.append((i + 1, loc_group, dem_group))
+    return groups
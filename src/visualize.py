@@ -35,7 +35,7 @@ class Visualizer:
             surf = font.render(line, True, (255, 255, 255))
             self.screen.blit(surf, (10, y + i * 22))
 
-    def draw(self, generation, route, distance, overlay=None):
+    def draw(self, generation, route, distance, overlay=None, telemetry=None):
         self.screen.fill((30, 30, 30))
 
         # eventos (permite fechar a janela)
@@ -65,6 +65,15 @@ class Visualizer:
         text2 = font.render(f"Distância (custo): {distance:.2f}", True, (255, 255, 255))
         self.screen.blit(text1, (10, 10))
         self.screen.blit(text2, (10, 40))
+        if telemetry is not None:
+            small = pygame.font.SysFont("Arial", 16)
+            text3 = small.render(
+                f"Média: {telemetry.mean:.2f}  Pior: {telemetry.worst:.2f}  "
+                f"Diversidade: {telemetry.diversity:.0%}  Pop. viável: {telemetry.feasible_ratio:.0%}  "
+                f"{telemetry.evals_per_s:,.0f} aval/s",
+                True, (180, 180, 180),
+            )
+            self.screen.blit(text3, (10, 70))
 
         self._last_overlay = overlay
         self._draw_overlay(self._last_overlay)